@@ -0,0 +1,152 @@
+import os
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Base URLs can be pointed at a local stub server (see stub_server.py).
+NOTION_API_URL = os.environ.get('NOTION_API_URL', 'https://api.notion.com/v1').rstrip('/')
+GEMINI_API_URL = os.environ.get('GEMINI_API_URL', 'https://generativelanguage.googleapis.com/v1beta').rstrip('/')
+GITHUB_API_URL = os.environ.get('GITHUB_API_URL', 'https://api.github.com').rstrip('/')
+NOTION_VERSION = '2022-06-28'
+
+# Notion allows an average of three requests per second per integration.
+NOTION_RATE = float(os.environ.get('NOTION_RATE_LIMIT', '3'))
+NOTION_BURST = 3
+MAX_RETRIES = 5
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 30.0
+DEFAULT_TIMEOUT = 30
+# 429 means the request was not processed, so it is always safe to retry.
+# Server errors are only retried for idempotent methods to avoid duplicate appends.
+IDEMPOTENT_METHODS = {'GET', 'DELETE', 'HEAD', 'OPTIONS'}
+RETRY_SERVER_ERRORS = {500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, up to `capacity` banked."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+_session = None
+_session_lock = threading.Lock()
+_limiters = {NOTION_API_URL: TokenBucket(NOTION_RATE, NOTION_BURST)}
+
+
+def get_session():
+    """Return the shared keep-alive session, creating it on first use."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+            _session = session
+        return _session
+
+
+def _limiter_for(url):
+    for base, limiter in _limiters.items():
+        if url.startswith(base):
+            return limiter
+    return None
+
+
+def _retry_delay(response, attempt):
+    retry_after = response.headers.get('Retry-After') if response is not None else None
+    if retry_after:
+        try:
+            return min(float(retry_after), BACKOFF_MAX)
+        except ValueError:
+            pass
+    return min(BACKOFF_BASE * (2 ** attempt), BACKOFF_MAX)
+
+
+def _should_retry(method, status_code):
+    if status_code == 429:
+        return True
+    return method in IDEMPOTENT_METHODS and status_code in RETRY_SERVER_ERRORS
+
+
+def request(method, url, **kwargs):
+    """Send a request through the pooled session with rate limiting and retries."""
+    method = method.upper()
+    kwargs.setdefault('timeout', DEFAULT_TIMEOUT)
+    limiter = _limiter_for(url)
+    session = get_session()
+    for attempt in range(MAX_RETRIES + 1):
+        if limiter:
+            limiter.acquire()
+        try:
+            response = session.request(method, url, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == MAX_RETRIES or method not in IDEMPOTENT_METHODS:
+                raise
+            time.sleep(_retry_delay(None, attempt))
+            continue
+        if attempt == MAX_RETRIES or not _should_retry(method, response.status_code):
+            return response
+        time.sleep(_retry_delay(response, attempt))
+    return response
+
+
+def get(url, **kwargs):
+    return request('GET', url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request('POST', url, **kwargs)
+
+
+def patch(url, **kwargs):
+    return request('PATCH', url, **kwargs)
+
+
+def delete(url, **kwargs):
+    return request('DELETE', url, **kwargs)
+
+
+def notion_headers(token):
+    """Standard Notion API headers for the given integration token."""
+    return {
+        'Authorization': f'Bearer {token}',
+        'Content-Type': 'application/json',
+        'Notion-Version': NOTION_VERSION
+    }
+
+
+def gemini_url(model='gemini-2.0-flash'):
+    return f'{GEMINI_API_URL}/models/{model}:generateContent'
+
+
+def generate_content(prompt, api_key, model='gemini-2.0-flash'):
+    """Send a prompt to Gemini and return the response text; raise on failure."""
+    headers = {"Content-Type": "application/json"}
+    data = {"contents": [{"parts": [{"text": prompt}]}]}
+    response = post(gemini_url(model), headers=headers, params={"key": api_key}, json=data)
+    if response.status_code != 200:
+        raise Exception(response.text)
+    try:
+        return response.json()['candidates'][0]['content']['parts'][0]['text'].strip()
+    except Exception as e:
+        raise Exception(f"Unexpected Gemini response: {str(e)}")
@@ -0,0 +1,176 @@
+"""Single entry point for the push-to-main documentation updates.
+
+Collects the commit data from git once, runs the Gemini requests for the changelog
+entry, codebase summary and (optionally) PR body concurrently, then writes
+CHANGELOG.md, the Notion pages and the PR body from those shared results.
+"""
+import argparse
+import os
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+TARGETS = ['changelog', 'notion-changelog', 'notion-commit', 'notion-summary', 'pr-body']
+# Environment each target needs; the per-script modules read these at import time.
+REQUIRED_ENV = {
+    'notion-changelog': ['NOTION_TOKEN', 'NOTION_CHANGELOG_DATABASE_ID'],
+    'notion-commit': ['NOTION_TOKEN', 'NOTION_PAGE_ID'],
+    'notion-summary': ['NOTION_TOKEN', 'NOTION_FULL_DESCRIPTION_PAGE'],
+    'pr-body': ['GITHUB_TOKEN'],
+}
+SCRIPT_ENV = ['NOTION_TOKEN', 'NOTION_CHANGELOG_DATABASE_ID', 'NOTION_PAGE_ID', 'NOTION_FULL_DESCRIPTION_PAGE']
+
+
+def configure_dry_run():
+    """Point every API at an in-process stub server unless URLs are already set."""
+    import stub_server
+    server = stub_server.serve(port=0)
+    base = f'http://127.0.0.1:{server.server_address[1]}'
+    os.environ.setdefault('NOTION_API_URL', f'{base}/notion/v1')
+    os.environ.setdefault('GEMINI_API_URL', f'{base}/gemini/v1beta')
+    os.environ.setdefault('GITHUB_API_URL', f'{base}/github')
+    os.environ.setdefault('GEMINI_API_KEY', 'stub')
+    os.environ.setdefault('GITHUB_TOKEN', 'stub')
+    for name in SCRIPT_ENV:
+        os.environ.setdefault(name, 'stub')
+    # Keep stub responses out of the real summary and LLM caches.
+    scratch = tempfile.mkdtemp()
+    os.environ.setdefault('SUMMARY_CACHE_FILE', os.path.join(scratch, 'file_summaries.json'))
+    os.environ.setdefault('LLM_CACHE_DIR', os.path.join(scratch, 'llm'))
+    print(f"Dry run: using stub endpoints at {base}")
+    return server
+
+
+def check_environment(targets, strict=False):
+    """Return the targets whose environment is set.
+
+    With strict=True (targets chosen explicitly) any missing variable is an error;
+    otherwise targets lacking configuration are skipped so the rest still run.
+    """
+    ready = []
+    for target in targets:
+        missing = [name for name in REQUIRED_ENV.get(target, []) if not os.environ.get(name)]
+        if not missing:
+            ready.append(target)
+        elif strict:
+            raise Exception(f"Missing environment variables for {target}: {', '.join(missing)}")
+        else:
+            print(f"Skipping {target}: missing {', '.join(missing)}")
+    # Unused targets' variables only need to exist so the script modules import.
+    for name in SCRIPT_ENV:
+        os.environ.setdefault(name, '')
+    return ready
+
+
+def run_pipeline(targets, repo=None, pr_number=None, dry_run=False, base='origin/main'):
+    """Collect git data once, fan out LLM calls, and write every selected target.
+
+    The PR body is generated from the whole PR (base...HEAD), not just the last commit.
+    """
+    # Imported here so dry-run/env defaults are in place before module-level config is read.
+    import changelog_and_notion
+    import generate_pr_body
+    import git_data
+    import update_notion
+    import update_summary_notion
+
+    commit = git_data.read_commit('HEAD')
+    diff = git_data.format_commit_diff(commit)
+    print(f"Commit {commit['short_hash']}: {len(commit['files'])} file(s) changed")
+
+    llm_jobs = {}
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        if {'changelog', 'notion-changelog'} & set(targets):
+            llm_jobs['changelog'] = pool.submit(changelog_and_notion.ai_generate_changelog, diff)
+        if 'notion-summary' in targets:
+            llm_jobs['summary'] = pool.submit(
+                update_summary_notion.analyze_codebase, update_summary_notion.get_source_files())
+        if 'pr-body' in targets:
+            llm_jobs['pr-body'] = pool.submit(
+                generate_pr_body.generate_pr_summary, generate_pr_body.get_pr_diff(base, 'HEAD'))
+    results = {name: job.result() for name, job in llm_jobs.items()}
+
+    entry = None
+    if 'changelog' in results:
+        entry = changelog_and_notion.format_changelog_entry(results['changelog'])
+    commit_info = {
+        'hash': commit['hash'],
+        'message': commit['message'],
+        'author': commit['author'],
+        'email': commit['email'],
+        'timestamp': git_data.commit_timestamp_iso(commit),
+        'changed_files': [f['path'] for f in commit['files']],
+    }
+
+    writers = {}
+    if 'changelog' in targets:
+        if dry_run:
+            writers['changelog'] = lambda: print(f"Dry run: CHANGELOG.md entry not written:{entry}")
+        else:
+            writers['changelog'] = lambda: changelog_and_notion.append_to_changelog(entry)
+    if 'notion-changelog' in targets:
+        writers['notion-changelog'] = lambda: changelog_and_notion.append_to_notion_page(entry)
+    if 'notion-commit' in targets:
+        writers['notion-commit'] = lambda: update_notion.update_notion_page(commit_info)
+    if 'notion-summary' in targets:
+        writers['notion-summary'] = lambda: update_summary_notion.update_notion_page(*results['summary'])
+    if 'pr-body' in targets:
+        writers['pr-body'] = lambda: generate_pr_body.update_github_pr_body(repo, pr_number, results['pr-body'])
+
+    # Each target writes to a different page or file, so they can go out together;
+    # Notion requests still share api_client's rate limiter.
+    failures = []
+    with ThreadPoolExecutor(max_workers=len(writers) or 1) as pool:
+        jobs = {name: pool.submit(write) for name, write in writers.items()}
+    for name, job in jobs.items():
+        try:
+            job.result()
+            print(f"Updated {name}")
+        except Exception as e:
+            failures.append(f"{name}: {str(e)}")
+    if failures:
+        raise Exception('; '.join(failures))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Update CHANGELOG.md, Notion pages and the PR body in one pass.")
+    parser.add_argument('--targets', type=str, default=None,
+                        help=f"Comma-separated subset of {','.join(TARGETS)} (default: all but pr-body, "
+                             "plus pr-body when --pr is given)")
+    parser.add_argument('--skip', type=str, default='', help='Comma-separated targets to leave out')
+    parser.add_argument('--repo', type=str, default=None, help='GitHub repository in owner/repo format')
+    parser.add_argument('--pr', type=str, default=None, help='Pull request number for the pr-body target')
+    parser.add_argument('--base', type=str, default=None,
+                        help='Base branch of the PR for the pr-body diff (default: GITHUB_BASE_REF or main)')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='Send all API calls to local stub endpoints and do not modify CHANGELOG.md')
+    args = parser.parse_args()
+
+    repo = args.repo or os.environ.get('GITHUB_REPOSITORY')
+    pr_number = args.pr or os.environ.get('GITHUB_PR_NUMBER')
+    base = f"origin/{args.base or os.environ.get('GITHUB_BASE_REF') or 'main'}"
+    if args.targets:
+        targets = [t.strip() for t in args.targets.split(',') if t.strip()]
+    else:
+        targets = [t for t in TARGETS if t != 'pr-body' or pr_number]
+    skip = {t.strip() for t in args.skip.split(',') if t.strip()}
+    targets = [t for t in targets if t not in skip]
+    unknown = [t for t in targets + list(skip) if t not in TARGETS]
+    if unknown:
+        parser.error(f"Unknown target(s): {', '.join(unknown)}")
+    if 'pr-body' in targets and not (repo and pr_number):
+        parser.error("pr-body needs --repo and --pr, or GITHUB_REPOSITORY and GITHUB_PR_NUMBER")
+
+    try:
+        if args.dry_run:
+            configure_dry_run()
+        targets = check_environment(targets, strict=bool(args.targets))
+        run_pipeline(targets, repo, pr_number, dry_run=args.dry_run, base=base)
+        print("Pipeline finished.")
+    except Exception as e:
+        print(f"Error running changelog pipeline: {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+import os
+import shutil
+
+COPY_BUFFER = 1024 * 1024
+
+
+def scan_header(path):
+    """Return the byte offset just after the first '---' line (0 if there is none)."""
+    offset = 0
+    with open(path, 'rb') as f:
+        for line in f:
+            offset += len(line)
+            if line.strip() == b'---':
+                return offset
+    return 0
+
+
+def insert_entry(path, entry):
+    """Insert entry after the changelog header without loading the file into memory.
+
+    Only the header is scanned for the '---' line (the scan stops there); the header
+    is copied, the entry written, and the rest of the file streamed into a temp file
+    that atomically replaces the original, so a crash never leaves a half-written
+    changelog.
+    """
+    data = (entry + '\n').encode('utf-8')
+    if not os.path.exists(path):
+        with open(path, 'wb') as f:
+            f.write(data)
+        return
+    offset = scan_header(path)
+    tmp_path = path + '.tmp'
+    with open(path, 'rb') as src, open(tmp_path, 'wb') as dst:
+        dst.write(src.read(offset))
+        dst.write(data)
+        shutil.copyfileobj(src, dst, COPY_BUFFER)
+        dst.flush()
+        os.fsync(dst.fileno())
+    shutil.copymode(path, tmp_path)
+    os.replace(tmp_path, path)
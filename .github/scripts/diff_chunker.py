@@ -0,0 +1,138 @@
+import fnmatch
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+# Rough budget per prompt; ~4 characters per token is close enough for code diffs.
+MAX_CHUNK_TOKENS = int(os.environ.get('DIFF_CHUNK_TOKENS', '20000'))
+CHARS_PER_TOKEN = 4
+MAP_WORKERS = 4
+
+SKIP_PATTERNS = [
+    '*.lock', 'package-lock.json', 'pnpm-lock.yaml', 'yarn.lock', 'poetry.lock', 'Pipfile.lock',
+    'Cargo.lock', 'go.sum', '*.min.js', '*.min.css', '*.map', '*_pb2.py', '*.pb.go',
+    'dist/*', 'build/*', '*/__pycache__/*', '*.pyc', '*.png', '*.jpg', '*.jpeg', '*.gif',
+    '*.ico', '*.pdf', '*.zip', '*.gz', '*.woff', '*.woff2', '*.ttf',
+]
+
+MAP_PROMPT = (
+    "You are summarizing one part of a larger code diff. Describe concisely, in bullet points, "
+    "what was changed, added, or fixed in this part. Mention file names.\n\n"
+    "Diff part {part} of {total}:\n{diff}\n\nSummary:"
+)
+
+
+def estimate_tokens(text):
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def split_diff_by_file(diff):
+    """Split a unified diff into (path, text) pairs; text before the first file gets path None."""
+    files = []
+    path, lines = None, []
+    for line in diff.splitlines(keepends=True):
+        if line.startswith('diff --git '):
+            if lines:
+                files.append((path, ''.join(lines)))
+            # "diff --git a/path b/path" -> path
+            path, lines = line.rstrip('\n').split(' b/', 1)[-1], []
+        lines.append(line)
+    if lines:
+        files.append((path, ''.join(lines)))
+    return files
+
+
+def should_skip(path, text):
+    """True for lockfiles, generated or binary files that add noise but no meaning."""
+    if path is None:
+        return False
+    name = os.path.basename(path)
+    if any(fnmatch.fnmatch(path, p) or fnmatch.fnmatch(name, p) for p in SKIP_PATTERNS):
+        return True
+    return 'GIT binary patch' in text or '\nBinary files ' in text
+
+
+def split_hunks(text, max_tokens):
+    """Split one file's diff at @@ hunk boundaries, repeating the file header on each piece."""
+    header, hunks = [], []
+    for line in text.splitlines(keepends=True):
+        if line.startswith('@@'):
+            hunks.append([line])
+        elif hunks:
+            hunks[-1].append(line)
+        else:
+            header.append(line)
+    header = ''.join(header)
+    max_chars = max(max_tokens * CHARS_PER_TOKEN - len(header), 1000)
+    pieces = []
+    for hunk in hunks:
+        hunk = ''.join(hunk)
+        # A single hunk over budget is cut; the summary only needs its gist.
+        while len(hunk) > max_chars:
+            pieces.append(header + hunk[:max_chars] + '\n[... hunk truncated ...]\n')
+            hunk = hunk[max_chars:]
+        pieces.append(header + hunk)
+    return pieces or [header[:max_chars]]
+
+
+def chunk_diff(diff, max_tokens=MAX_CHUNK_TOKENS):
+    """Return (chunks, skipped_paths): diff text packed into chunks under the token budget."""
+    pieces, skipped = [], []
+    for path, text in split_diff_by_file(diff):
+        if should_skip(path, text):
+            skipped.append(path)
+        elif estimate_tokens(text) > max_tokens:
+            pieces.extend(split_hunks(text, max_tokens))
+        else:
+            pieces.append(text)
+    chunks, current = [], ''
+    for piece in pieces:
+        if current and estimate_tokens(current + piece) > max_tokens:
+            chunks.append(current)
+            current = ''
+        current += piece
+    if current:
+        chunks.append(current)
+    return chunks, skipped
+
+
+def _map(generate, texts):
+    prompts = [MAP_PROMPT.format(part=i, total=len(texts), diff=text) for i, text in enumerate(texts, 1)]
+    with ThreadPoolExecutor(max_workers=MAP_WORKERS) as pool:
+        return list(pool.map(generate, prompts))
+
+
+def _pack(texts, max_tokens):
+    groups, current = [], ''
+    for text in texts:
+        if current and estimate_tokens(current + text) > max_tokens:
+            groups.append(current)
+            current = ''
+        current += text + '\n\n'
+    if current:
+        groups.append(current)
+    return groups
+
+
+def summarize_diff(diff, generate, build_prompt, max_tokens=MAX_CHUNK_TOKENS):
+    """Summarize a diff of any size with `generate(prompt) -> text`.
+
+    Small diffs go straight to `build_prompt(diff)`. Larger ones are split by file and
+    hunk, each chunk is summarized concurrently, and the partial summaries are passed
+    to `build_prompt` in place of the diff for the final reduce step.
+    """
+    chunks, skipped = chunk_diff(diff, max_tokens)
+    if skipped:
+        print(f"Skipping {len(skipped)} generated/binary/lock file(s): {', '.join(skipped)}")
+    if not chunks:
+        return generate(build_prompt('(only generated, binary or lock files changed)'))
+    if len(chunks) == 1:
+        return generate(build_prompt(chunks[0]))
+    summaries = _map(generate, chunks)
+    # Partial summaries can themselves exceed the budget on very large diffs.
+    while estimate_tokens('\n\n'.join(summaries)) > max_tokens:
+        groups = _pack(summaries, max_tokens)
+        if len(groups) >= len(summaries):
+            break
+        summaries = _map(generate, groups)
+    combined = '\n\n'.join(f"Part {i}:\n{s}" for i, s in enumerate(summaries, 1))
+    return generate(build_prompt(f"(Diff too large to show; summaries of each part follow.)\n\n{combined}"))
@@ -1,9 +1,10 @@
 import os
 import subprocess
-import requests
+import api_client
+import diff_chunker
+import llm_client
 import argparse
 
-GEMINI_API_KEY = os.environ.get('GEMINI_API_KEY')
 GITHUB_TOKEN = os.environ.get('GITHUB_TOKEN')
 
 def get_pr_diff(base, head):
@@ -11,11 +12,9 @@ def get_pr_diff(base, head):
     diff = subprocess.check_output(['git', 'diff', f'{base}...{head}']).decode('utf-8')
     return diff
 
-def generate_pr_summary(diff):
-    """Use Gemini to generate a PR summary and feature list."""
-    if not GEMINI_API_KEY:
-        return "(AI PR summary unavailable: GEMINI_API_KEY not set)"
-    prompt = (
+def build_pr_prompt(diff):
+    """Build the PR body prompt for a diff (or for per-chunk summaries of a large diff)."""
+    return (
         "Given the following code diff from a pull request, generate a concise PR body including:\n"
         "- A high-level summary of what the PR does\n"
         "- A bullet-point list of key changes or features\n\n"
@@ -24,35 +23,29 @@ def generate_pr_summary(diff):
         "SUMMARY:\n[Your summary here]\n\n"
         "FEATURES:\n- [feature 1]\n- [feature 2]\n"
     )
-    headers = {"Content-Type": "application/json"}
-    data = {
-        "contents": [
-            {"parts": [{"text": prompt}]}
-        ]
-    }
-    url = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent"
-    response = requests.post(url, headers=headers, params={"key": GEMINI_API_KEY}, json=data)
-    if response.status_code == 200:
-        try:
-            result = response.json()['candidates'][0]['content']['parts'][0]['text'].strip()
-            return result
-        except Exception as e:
-            return f"(AI PR summary failed: Unexpected Gemini response: {str(e)})"
-    else:
-        return f"(AI PR summary failed: {response.text})"
+
+def generate_pr_summary(diff):
+    """Use Gemini to generate a PR summary and feature list."""
+    if not llm_client.available():
+        return "(AI PR summary unavailable: GEMINI_API_KEY not set)"
+    try:
+        return diff_chunker.summarize_diff(
+            diff, llm_client.generate, build_pr_prompt)
+    except Exception as e:
+        return f"(AI PR summary failed: {str(e)})"
 
 def update_github_pr_body(repo, pr_number, pr_body):
     """Update the PR body using the GitHub API."""
     if not (GITHUB_TOKEN and repo and pr_number):
         print("Missing GitHub environment variables or arguments.")
         return
-    url = f"https://api.github.com/repos/{repo}/pulls/{pr_number}"
+    url = f"{api_client.GITHUB_API_URL}/repos/{repo}/pulls/{pr_number}"
     headers = {
         "Authorization": f"token {GITHUB_TOKEN}",
         "Accept": "application/vnd.github+json"
     }
     data = {"body": pr_body}
-    response = requests.patch(url, headers=headers, json=data)
+    response = api_client.patch(url, headers=headers, json=data)
     if response.status_code not in (200, 201):
         print(f"Failed to update PR body: {response.text}")
     else:
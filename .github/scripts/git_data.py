@@ -0,0 +1,81 @@
+import subprocess
+from datetime import datetime
+
+# Header fields are separated by \x1f and the header is terminated by \x1e, so the
+# free-form commit message can contain anything except those control characters.
+FIELDS = ['hash', 'short_hash', 'author', 'email', 'timestamp', 'date', 'subject', 'message']
+LOG_FORMAT = '%H%x1f%h%x1f%an%x1f%ae%x1f%at%x1f%ad%x1f%s%x1f%B%x1e'
+
+
+def _git_log_lines(rev, repo, context):
+    cmd = ['git']
+    if repo:
+        cmd += ['-C', repo]
+    cmd += ['-c', 'core.quotepath=off', 'log', '-1', f'--format={LOG_FORMAT}', '--date=short',
+            '--numstat', '-p', f'--unified={context}', '--no-renames', '--no-color', rev, '--']
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True, encoding='utf-8', errors='replace')
+    try:
+        yield from process.stdout
+    finally:
+        process.stdout.close()
+        if process.wait() != 0:
+            raise subprocess.CalledProcessError(process.returncode, cmd)
+
+
+def _parse_numstat(line):
+    added, deleted, path = line.rstrip('\n').split('\t', 2)
+    # Binary files report "-" for both counts.
+    return {
+        'path': path,
+        'added': None if added == '-' else int(added),
+        'deleted': None if deleted == '-' else int(deleted),
+        'binary': added == '-',
+    }
+
+
+def read_commit(rev='HEAD', repo=None, context=3):
+    """Read hash, metadata, changed files and per-file diffs of one commit.
+
+    Everything comes from a single streamed `git log -1 --numstat -p` and is parsed
+    line by line, so a commit touching many files still costs one process.
+    """
+    header, files, diffs = '', [], {}
+    current = None
+    state = 'header'
+    for line in _git_log_lines(rev, repo, context):
+        if state == 'header':
+            header += line
+            if '\x1e' in line:
+                state = 'numstat'
+            continue
+        if line.startswith('diff --git '):
+            state = 'patch'
+            # --numstat lists files in the same order as the patch sections.
+            current = files[len(diffs)]['path'] if len(diffs) < len(files) else line.split(' b/', 1)[-1].strip()
+            diffs[current] = line
+        elif state == 'numstat':
+            if line.strip():
+                files.append(_parse_numstat(line))
+        else:
+            diffs[current] += line
+
+    values = header.split('\x1e', 1)[0].split('\x1f')
+    if len(values) != len(FIELDS):
+        raise Exception(f"Unexpected git log output for {rev}: {values}")
+    commit = dict(zip(FIELDS, values))
+    commit['hash'] = commit['hash'].strip()
+    commit['timestamp'] = int(commit['timestamp'])
+    commit['message'] = commit['message'].strip()
+    commit['files'] = files
+    commit['diffs'] = diffs
+    return commit
+
+
+def format_commit_diff(commit):
+    """Render a commit like `git show --pretty=format:'%h %s (%an, %ad)'`."""
+    header = f"{commit['short_hash']} {commit['subject']} ({commit['author']}, {commit['date']})\n"
+    return header + ''.join(commit['diffs'].values())
+
+
+def commit_timestamp_iso(commit):
+    return datetime.fromtimestamp(commit['timestamp']).isoformat()
@@ -0,0 +1,122 @@
+"""Shared Gemini client with an on-disk response cache and an offline stub backend.
+
+LLM_BACKEND=stub returns deterministic canned responses without any network access.
+Responses from the real backend are cached under LLM_CACHE_DIR keyed by a hash of
+endpoint, model and prompt, expire after LLM_CACHE_TTL seconds, and the least
+recently used entries are evicted once the cache exceeds LLM_CACHE_MAX_BYTES.
+"""
+import hashlib
+import json
+import os
+import time
+
+import api_client
+
+DEFAULT_MODEL = 'gemini-2.0-flash'
+LLM_BACKEND = os.environ.get('LLM_BACKEND', 'gemini').strip().lower()
+GEMINI_API_KEY = os.environ.get('GEMINI_API_KEY')
+CACHE_DIR = os.environ.get('LLM_CACHE_DIR', '.github/cache/llm')
+CACHE_TTL = int(os.environ.get('LLM_CACHE_TTL', str(7 * 24 * 3600)))
+CACHE_MAX_BYTES = int(os.environ.get('LLM_CACHE_MAX_BYTES', str(50 * 1024 * 1024)))
+CACHE_ENABLED = os.environ.get('LLM_CACHE', '1') != '0'
+
+
+def available():
+    """True if generate() can be called: stub backend, or Gemini with an API key."""
+    return LLM_BACKEND == 'stub' or bool(GEMINI_API_KEY)
+
+
+def cache_key(prompt, model):
+    # The endpoint is part of the key so stub-server responses never mix with real ones.
+    material = f"{api_client.GEMINI_API_URL}\0{model}\0{prompt}".encode('utf-8')
+    return hashlib.sha256(material).hexdigest()
+
+
+def _cache_path(key):
+    return os.path.join(CACHE_DIR, key[:2], f'{key}.json')
+
+
+def cache_get(key):
+    """Return the cached response for key, or None if missing or expired."""
+    path = _cache_path(key)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            entry = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+    if time.time() - entry.get('created', 0) > CACHE_TTL:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        return None
+    # Touch on hit so eviction drops the least recently used entries. A concurrent
+    # evict() may already have removed it; the response read above is still good.
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+    return entry['response']
+
+
+def cache_put(key, model, response):
+    path = _cache_path(key)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.{time.monotonic_ns()}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'model': model, 'created': time.time(), 'response': response}, f)
+    os.replace(tmp_path, path)
+    evict()
+
+
+def evict(max_bytes=None):
+    """Delete expired entries, then least recently used ones until under max_bytes."""
+    max_bytes = CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    entries = []
+    now = time.time()
+    for root, _, files in os.walk(CACHE_DIR):
+        for name in files:
+            path = os.path.join(root, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            if now - stat.st_mtime > CACHE_TTL and name.endswith('.json'):
+                os.remove(path)
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        total -= size
+
+
+def stub_generate(prompt, model=DEFAULT_MODEL):
+    """Deterministic offline response shaped like the formats the scripts ask for."""
+    digest = hashlib.sha256(f"{model}\0{prompt}".encode('utf-8')).hexdigest()[:8]
+    return (
+        f"SUMMARY:\nStub response {digest} for a {len(prompt)}-character prompt.\n\n"
+        f"FEATURES:\n- Stub feature {digest}"
+    )
+
+
+def generate(prompt, model=DEFAULT_MODEL):
+    """Return the model's response text for prompt; raise on failure."""
+    if LLM_BACKEND == 'stub':
+        return stub_generate(prompt, model)
+    if not GEMINI_API_KEY:
+        raise Exception("GEMINI_API_KEY not set")
+    key = cache_key(prompt, model) if CACHE_ENABLED else None
+    if key:
+        cached = cache_get(key)
+        if cached is not None:
+            return cached
+    response = api_client.generate_content(prompt, GEMINI_API_KEY, model)
+    if key:
+        cache_put(key, model, response)
+    return response
@@ -0,0 +1,155 @@
+import json
+import os
+import re
+from datetime import datetime, timedelta, timezone
+
+import api_client
+
+# Notion API limits: children per append request and characters per rich_text item.
+MAX_BLOCKS_PER_REQUEST = 100
+MAX_TEXT_LENGTH = 2000
+NESTED_MARKER = re.compile(r'^[-*]\s+')
+# Cached page children keyed by page id and validated against last_edited_time.
+PAGE_CACHE_FILE = os.environ.get('NOTION_PAGE_CACHE_FILE', '.github/cache/notion_pages.json')
+# Notion truncates last_edited_time to the minute, so a read taken within a minute
+# of the last edit may have missed a later edit in that same minute.
+EDIT_TIME_GRANULARITY = timedelta(minutes=1)
+
+
+def rich_text(text):
+    """Build a rich_text array, splitting text into items of at most 2000 characters."""
+    text = text or ''
+    pieces = [text[i:i + MAX_TEXT_LENGTH] for i in range(0, len(text), MAX_TEXT_LENGTH)] or ['']
+    return [{"type": "text", "text": {"content": piece}} for piece in pieces]
+
+
+def text_block(block_type, text):
+    return {"object": "block", "type": block_type, block_type: {"rich_text": rich_text(text)}}
+
+
+def heading(level, text):
+    return text_block(f"heading_{level}", text)
+
+
+def paragraph(text):
+    return text_block("paragraph", text)
+
+
+def bullet(text):
+    return text_block("bulleted_list_item", text)
+
+
+def divider():
+    return {"object": "block", "type": "divider", "divider": {}}
+
+
+def markdown_to_blocks(markdown):
+    """Convert simple markdown (#/##/### headings, -/* bullets, --- rules, text) to blocks."""
+    blocks = []
+    for line in markdown.splitlines():
+        stripped = line.strip()
+        if not stripped:
+            continue
+        if stripped == '---':
+            blocks.append(divider())
+        elif stripped.startswith('### '):
+            blocks.append(heading(3, stripped[4:].strip()))
+        elif stripped.startswith('## '):
+            blocks.append(heading(2, stripped[3:].strip()))
+        elif stripped.startswith('# '):
+            blocks.append(heading(1, stripped[2:].strip()))
+        elif stripped.startswith('- ') or stripped.startswith('* '):
+            # AI output often nests a second marker ("- *   text"); drop it but keep **bold**.
+            content = NESTED_MARKER.sub('', stripped[2:].strip())
+            if content:
+                blocks.append(bullet(content))
+        else:
+            blocks.append(paragraph(stripped))
+    return blocks
+
+
+def append_blocks(token, parent_id, blocks):
+    """Append blocks to a Notion page or block in batches of at most 100.
+
+    Batches are sent one after another on the shared keep-alive session: Notion
+    appends to the end of the page, so a later batch must not land before an
+    earlier one. Throttling and 429 retries are handled by api_client.
+    """
+    url = f'{api_client.NOTION_API_URL}/blocks/{parent_id}/children'
+    headers = api_client.notion_headers(token)
+    results = []
+    for start in range(0, len(blocks), MAX_BLOCKS_PER_REQUEST):
+        batch = blocks[start:start + MAX_BLOCKS_PER_REQUEST]
+        response = api_client.patch(url, headers=headers, json={"children": batch})
+        if response.status_code not in (200, 201, 204):
+            raise Exception(f"Failed to append blocks {start}-{start + len(batch) - 1}: {response.text}")
+        results.extend(response.json().get('results', []) if response.content else [])
+    return results
+
+
+def block_text(block):
+    """Plain text of a block's rich_text, whether read from Notion or built locally."""
+    block_type = block['type']
+    rich = block.get(block_type, {}).get('rich_text', [])
+    return ''.join(t.get('plain_text') or t.get('text', {}).get('content', '') for t in rich)
+
+
+def read_children(token, parent_id):
+    """Read all child blocks of a page or block, following pagination cursors."""
+    url = f'{api_client.NOTION_API_URL}/blocks/{parent_id}/children'
+    headers = api_client.notion_headers(token)
+    blocks = []
+    params = {'page_size': MAX_BLOCKS_PER_REQUEST}
+    while True:
+        response = api_client.get(url, headers=headers, params=params)
+        if response.status_code != 200:
+            raise Exception(f"Failed to read Notion page children: {response.text}")
+        payload = response.json()
+        blocks.extend(payload.get('results', []))
+        if not payload.get('has_more') or not payload.get('next_cursor'):
+            return blocks
+        params['start_cursor'] = payload['next_cursor']
+
+
+def _parse_time(value):
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+def _load_page_cache():
+    try:
+        with open(PAGE_CACHE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def _save_page_cache(cache):
+    os.makedirs(os.path.dirname(PAGE_CACHE_FILE) or '.', exist_ok=True)
+    tmp_file = PAGE_CACHE_FILE + '.tmp'
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(cache, f)
+    os.replace(tmp_file, PAGE_CACHE_FILE)
+
+
+def read_children_cached(token, page_id):
+    """Like read_children, but reuse a local copy while the page's last_edited_time is unchanged.
+
+    Costs one block retrieve when the page has not been edited since the cached read.
+    """
+    response = api_client.get(f'{api_client.NOTION_API_URL}/blocks/{page_id}',
+                              headers=api_client.notion_headers(token))
+    if response.status_code != 200:
+        raise Exception(f"Failed to read Notion page: {response.text}")
+    last_edited = response.json().get('last_edited_time')
+    cache = _load_page_cache()
+    cached = cache.get(page_id)
+    if (cached and last_edited and cached['last_edited_time'] == last_edited
+            and _parse_time(cached['fetched_at']) - _parse_time(last_edited) >= EDIT_TIME_GRANULARITY):
+        return cached['blocks']
+    fetched_at = datetime.now(timezone.utc).isoformat()
+    blocks = read_children(token, page_id)
+    if last_edited:
+        cache[page_id] = {'last_edited_time': last_edited, 'fetched_at': fetched_at, 'blocks': blocks}
+        _save_page_cache(cache)
+    return blocks
+
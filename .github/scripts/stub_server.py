@@ -0,0 +1,166 @@
+"""Local stand-in for the Notion, Gemini and GitHub APIs.
+
+Run it and point the scripts at it:
+
+    python .github/scripts/stub_server.py --port 8765 &
+    NOTION_API_URL=http://127.0.0.1:8765/notion/v1 \
+    GEMINI_API_URL=http://127.0.0.1:8765/gemini/v1beta \
+    GITHUB_API_URL=http://127.0.0.1:8765/github \
+    NOTION_TOKEN=stub ... python .github/scripts/update_notion.py
+"""
+import argparse
+import json
+import threading
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+
+class NotionStore:
+    """In-memory page children so appends, paginated reads and deletes round-trip."""
+
+    def __init__(self):
+        self.children = {}
+        self.parents = {}
+        self.edited = {}
+        self.lock = threading.Lock()
+
+    def append(self, parent_id, blocks):
+        results = []
+        with self.lock:
+            for block in blocks:
+                block = dict(block, id=str(uuid.uuid4()))
+                block_type = block.get('type')
+                for text in block.get(block_type, {}).get('rich_text', []):
+                    text.setdefault('plain_text', text.get('text', {}).get('content', ''))
+                self.children.setdefault(parent_id, []).append(block)
+                self.parents[block['id']] = parent_id
+                results.append(block)
+            self.touch(parent_id)
+        return {'object': 'list', 'results': results}
+
+    def list(self, parent_id, page_size, cursor):
+        with self.lock:
+            blocks = list(self.children.get(parent_id, []))
+        start = int(cursor) if cursor else 0
+        end = start + page_size
+        has_more = end < len(blocks)
+        return {'object': 'list', 'results': blocks[start:end], 'has_more': has_more,
+                'next_cursor': str(end) if has_more else None}
+
+    def delete(self, block_id):
+        with self.lock:
+            parent_id = self.parents.pop(block_id, None)
+            if parent_id is None:
+                return False
+            self.children[parent_id] = [b for b in self.children[parent_id] if b['id'] != block_id]
+            self.touch(parent_id)
+            return True
+
+    def touch(self, parent_id):
+        # Like Notion, edit times are truncated to the minute.
+        now = datetime.now(timezone.utc).replace(second=0, microsecond=0)
+        self.edited[parent_id] = now.isoformat().replace('+00:00', '.000Z')
+
+    def retrieve(self, block_id):
+        with self.lock:
+            last_edited = self.edited.get(block_id, '2024-01-01T00:00:00.000Z')
+        return {'object': 'block', 'id': block_id, 'last_edited_time': last_edited}
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    # Every Nth request is answered with 429 + Retry-After to exercise backoff.
+    throttle_every = 0
+    request_count = 0
+    store = NotionStore()
+    count_lock = threading.Lock()
+
+    def _respond(self, status, payload, headers=None):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        if not length:
+            return {}
+        return json.loads(self.rfile.read(length) or b'{}')
+
+    def _handle(self):
+        payload = self._read_json()
+        with self.count_lock:
+            StubHandler.request_count += 1
+            count = StubHandler.request_count
+        if self.throttle_every and count % self.throttle_every == 0:
+            self._respond(429, {'message': 'rate limited'}, {'Retry-After': '0.1'})
+            return
+        if self.path.startswith('/gemini/'):
+            prompt = payload.get('contents', [{}])[0].get('parts', [{}])[0].get('text', '')
+            text = f"SUMMARY:\nStub summary ({len(prompt)} prompt chars).\n\nFEATURES:\n- Stub feature"
+            self._respond(200, {'candidates': [{'content': {'parts': [{'text': text}]}}]})
+        elif self.path.startswith('/notion/'):
+            self._handle_notion(payload)
+        else:
+            self._respond(200, {'object': 'stub', 'path': self.path})
+
+    def _handle_notion(self, payload):
+        url = urlparse(self.path)
+        parts = url.path.rstrip('/').split('/')
+        block_id = parts[parts.index('blocks') + 1] if 'blocks' in parts else None
+        if self.command == 'GET' and parts[-1] == 'children':
+            query = parse_qs(url.query)
+            page_size = int(query.get('page_size', ['100'])[0])
+            cursor = query.get('start_cursor', [None])[0]
+            self._respond(200, self.store.list(block_id, page_size, cursor))
+        elif self.command == 'GET' and block_id:
+            self._respond(200, self.store.retrieve(block_id))
+        elif self.command == 'PATCH' and parts[-1] == 'children':
+            children = payload.get('children', [])
+            if len(children) > 100:
+                self._respond(400, {'message': 'body.children.length should be <= 100'})
+                return
+            self._respond(200, self.store.append(block_id, children))
+        elif self.command == 'DELETE' and block_id:
+            if self.store.delete(block_id):
+                self._respond(200, {'object': 'block', 'id': block_id, 'archived': True})
+            else:
+                self._respond(404, {'message': 'block not found'})
+        else:
+            self._respond(200, {'object': 'stub', 'path': self.path})
+
+    do_GET = _handle
+    do_POST = _handle
+    do_PATCH = _handle
+    do_DELETE = _handle
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(port=8765, throttle_every=0):
+    """Start the stub server in a background thread and return it."""
+    StubHandler.throttle_every = throttle_every
+    server = ThreadingHTTPServer(('127.0.0.1', port), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve stub Notion/Gemini/GitHub endpoints locally.")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--throttle-every', type=int, default=0, help='Answer every Nth request with 429')
+    args = parser.parse_args()
+    StubHandler.throttle_every = args.throttle_every
+    server = ThreadingHTTPServer(('127.0.0.1', args.port), StubHandler)
+    print(f"Stub API server listening on http://127.0.0.1:{args.port}")
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,12 +1,23 @@
+import hashlib
+import json
 import os
 import subprocess
-import requests
+import api_client
+import llm_client
+import notion_blocks
 from pathlib import Path
 import re
+from concurrent.futures import ThreadPoolExecutor
 
-GEMINI_API_KEY = os.environ.get('GEMINI_API_KEY')
 NOTION_TOKEN = os.environ['NOTION_TOKEN']
 NOTION_PAGE_ID = os.environ['NOTION_FULL_DESCRIPTION_PAGE']
+# Set to 1 to delete and re-create every block instead of only the changed tail.
+FULL_REWRITE = os.environ.get('NOTION_SUMMARY_FULL_REWRITE') == '1'
+# Deletes share api_client's Notion rate limiter, so a few workers are enough.
+DELETE_WORKERS = 4
+# Per-file summaries keyed by git blob SHA; persisted between runs by the workflow cache.
+SUMMARY_CACHE_FILE = os.environ.get('SUMMARY_CACHE_FILE', '.github/cache/file_summaries.json')
+SUMMARY_WORKERS = 4
 
 def get_source_files():
     """Get all Python source files in the repository."""
@@ -30,207 +41,189 @@ def read_file_content(file_path):
         print(f"Error reading {file_path}: {str(e)}")
         return ""
 
-def analyze_codebase(files):
-    """Use Gemini to analyze the codebase and generate summary and features."""
-    if not GEMINI_API_KEY:
-        return "(AI analysis unavailable: GEMINI_API_KEY not set)", []
+def git_blob_sha(content):
+    """Return the git blob SHA-1 of the given text, as `git hash-object` would."""
+    data = content.encode('utf-8')
+    return hashlib.sha1(b'blob %d\0' % len(data) + data).hexdigest()
+
+def load_summary_cache():
+    """Load cached per-file summaries keyed by path."""
+    try:
+        with open(SUMMARY_CACHE_FILE, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+def save_summary_cache(cache):
+    os.makedirs(os.path.dirname(SUMMARY_CACHE_FILE) or '.', exist_ok=True)
+    tmp_file = SUMMARY_CACHE_FILE + '.tmp'
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, indent=2, sort_keys=True)
+    os.replace(tmp_file, SUMMARY_CACHE_FILE)
 
-    all_content = ""
+def summarize_file(file, content):
+    """Ask Gemini for a short summary of a single source file."""
+    prompt = (
+        "You are a code analyzer. Given the following source file, write a short summary "
+        "of its purpose followed by a bullet-point list of the features it implements.\n\n"
+        f"File: {file}\nContent:\n{content}\n"
+    )
+    return llm_client.generate(prompt)
+
+def summarize_changed_files(files, cache):
+    """Re-summarize only files whose blob SHA differs from the cache; update the cache in place."""
+    entries = {}
+    stale = []
     for file in files:
         content = read_file_content(file)
-        all_content += f"\nFile: {file}\nContent:\n{content}\n"
+        sha = git_blob_sha(content)
+        cached = cache.get('files', {}).get(file)
+        if cached and cached.get('sha') == sha:
+            entries[file] = cached
+        else:
+            stale.append((file, content, sha))
+
+    def summarize(item):
+        file, content, sha = item
+        try:
+            return file, {'sha': sha, 'summary': summarize_file(file, content)}, None
+        except Exception as e:
+            return file, None, e
+
+    errors = []
+    with ThreadPoolExecutor(max_workers=SUMMARY_WORKERS) as pool:
+        for file, entry, error in pool.map(summarize, stale):
+            if error:
+                errors.append(f"{file}: {error}")
+            else:
+                entries[file] = entry
+    # Entries for deleted files are dropped by rebuilding the mapping.
+    cache['files'] = entries
+    print(f"Summarized {len(stale)} changed file(s), reused {len(files) - len(stale)} cached.")
+    if errors:
+        # Keep the summaries that did succeed for the next run.
+        save_summary_cache(cache)
+        raise Exception('; '.join(errors))
+    return entries
+
+def analyze_codebase(files):
+    """Use Gemini to analyze the codebase and generate summary and features.
+
+    Per-file summaries are cached by git blob SHA, so only changed files are sent to
+    Gemini; the final summary is a merge of the (mostly cached) per-file summaries.
+    """
+    if not llm_client.available():
+        return "(AI analysis unavailable: GEMINI_API_KEY not set)", []
+
+    cache = load_summary_cache()
+    try:
+        entries = summarize_changed_files(files, cache)
+    except Exception as e:
+        return f"(AI analysis failed: {str(e)})", ""
 
+    merge_key = hashlib.sha1(''.join(f"{f}:{entries[f]['sha']}\n" for f in sorted(entries)).encode('utf-8')).hexdigest()
+    merged = cache.get('merged', {})
+    if merged.get('key') == merge_key:
+        save_summary_cache(cache)
+        return merged['summary'], merged['features']
+
+    all_summaries = "".join(f"\nFile: {f}\nSummary:\n{entries[f]['summary']}\n" for f in sorted(entries))
     prompt = (
-        "You are a code analyzer. Given the following codebase, provide:\n"
+        "You are a code analyzer. Given the following per-file summaries of a codebase, provide:\n"
         "1. A brief, clear summary of what the program does (2-3 sentences)\n"
         "2. A bullet-point list of key features and functionality\n\n"
-        "Here's the codebase:\n" + all_content + "\n\n"
+        "Here are the file summaries:\n" + all_summaries + "\n\n"
         "Please format your response as follows:\n"
         "SUMMARY:\n[Your summary here]\n\n"
         "FEATURES:\n- [feature 1]\n- [feature 2]\netc."
     )
+    try:
+        result = llm_client.generate(prompt)
+        # Split the response into summary and features
+        summary_part = result.split('FEATURES:')[0].replace('SUMMARY:', '').strip()
+        features_part = result.split('FEATURES:')[1].strip()
+    except Exception as e:
+        save_summary_cache(cache)
+        return f"(AI analysis failed: {str(e)})", ""
+    cache['merged'] = {'key': merge_key, 'summary': summary_part, 'features': features_part}
+    save_summary_cache(cache)
+    return summary_part, features_part
 
-    headers = {
-        "Content-Type": "application/json"
-    }
-    
-    data = {
-        "contents": [
-            {"parts": [{"text": prompt}]}
-        ]
-    }
-    
-    url = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent"
-    response = requests.post(url, headers=headers, params={"key": GEMINI_API_KEY}, json=data)
-    
-    if response.status_code == 200:
-        try:
-            result = response.json()['candidates'][0]['content']['parts'][0]['text'].strip()
-            # Split the response into summary and features
-            summary_part = result.split('FEATURES:')[0].replace('SUMMARY:', '').strip()
-            features_part = result.split('FEATURES:')[1].strip()
-            return summary_part, features_part
-        except Exception as e:
-            return f"(AI analysis failed: Unexpected Gemini response: {str(e)})", ""
-    else:
-        return f"(AI analysis failed: {response.text})", ""
+def get_notion_page_blocks(page_id):
+    """Get all child blocks of a Notion page, following pagination cursors."""
+    return notion_blocks.read_children(NOTION_TOKEN, page_id)
 
 def get_notion_page_children(page_id):
     """Get all child block IDs of a Notion page."""
-    url = f"https://api.notion.com/v1/blocks/{page_id}/children?page_size=100"
-    headers = {
-        'Authorization': f'Bearer {NOTION_TOKEN}',
-        'Notion-Version': '2022-06-28'
-    }
-    response = requests.get(url, headers=headers)
-    if response.status_code == 200:
-        blocks = response.json().get('results', [])
-        return [block['id'] for block in blocks]
-    else:
-        return []
+    return [block['id'] for block in get_notion_page_blocks(page_id)]
+
+def delete_notion_blocks(block_ids):
+    """Delete the given blocks concurrently; raise if any deletion fails."""
+    headers = api_client.notion_headers(NOTION_TOKEN)
+
+    def delete_block(block_id):
+        response = api_client.delete(f"{api_client.NOTION_API_URL}/blocks/{block_id}", headers=headers)
+        # 404 means the block is already gone, which is what we want.
+        return block_id, response.status_code in (200, 404)
+
+    with ThreadPoolExecutor(max_workers=DELETE_WORKERS) as pool:
+        failed = [block_id for block_id, ok in pool.map(delete_block, block_ids) if not ok]
+    if failed:
+        raise Exception(f"Failed to delete {len(failed)} Notion block(s): {', '.join(failed[:5])}")
 
 def delete_notion_page_children(page_id):
     """Delete all child blocks of a Notion page (except the title)."""
-    block_ids = get_notion_page_children(page_id)
-    headers = {
-        'Authorization': f'Bearer {NOTION_TOKEN}',
-        'Notion-Version': '2022-06-28'
-    }
-    for block_id in block_ids:
-        url = f"https://api.notion.com/v1/blocks/{block_id}"
-        requests.delete(url, headers=headers)
+    delete_notion_blocks(get_notion_page_children(page_id))
+
+def block_signature(block):
+    """Return (type, text) for a block, whether read from Notion or built locally."""
+    return block['type'], notion_blocks.block_text(block)
 
 def parse_features_to_blocks(summary, features):
     """Convert summary and features text into Notion block objects with file names as headings (heading_2)."""
-    blocks = []
-    # Add summary as a heading and paragraph
-    blocks.append({
-        "object": "block",
-        "type": "heading_1",
-        "heading_1": {
-            "rich_text": [{
-                "type": "text",
-                "text": {"content": "Program Summary"}
-            }]
-        }
-    })
+    blocks = [notion_blocks.heading(1, "Program Summary")]
     if summary:
-        blocks.append({
-            "object": "block",
-            "type": "paragraph",
-            "paragraph": {
-                "rich_text": [{
-                    "type": "text",
-                    "text": {"content": summary}
-                }]
-            }
-        })
-    # Add features as a heading
-    blocks.append({
-        "object": "block",
-        "type": "heading_1",
-        "heading_1": {
-            "rich_text": [{
-                "type": "text",
-                "text": {"content": "Features"}
-            }]
-        }
-    })
+        blocks.append(notion_blocks.paragraph(summary))
+    blocks.append(notion_blocks.heading(1, "Features"))
     # Regex for file name as heading
     file_heading_pattern = re.compile(r'^(?:\*|-)?\s*\*\*(.+?)\*\*:?\s*$|^(?:\*|-)?\s*([\w\-\.]+\.py):\s*$')
-    lines = features.splitlines()
-    i = 0
-    while i < len(lines):
-        line = lines[i].strip()
+    for line in features.splitlines():
+        line = line.strip()
         # File name as heading_2 (matches * **file.py:**, - **file.py:**, **file.py:**, or file.py:)
         match = file_heading_pattern.match(line)
-        file_name = None
         if match:
             file_name = match.group(1) or match.group(2)
             if file_name:
-                blocks.append({
-                    "object": "block",
-                    "type": "heading_2",
-                    "heading_2": {
-                        "rich_text": [{
-                            "type": "text",
-                            "text": {"content": file_name}
-                        }]
-                    }
-                })
-            i += 1
-            # Collect following bullet points
-            while i < len(lines):
-                next_line = lines[i].strip()
-                if next_line.startswith("*") or next_line.startswith("-"):
-                    # Only treat as bullet if not a file name line
-                    if not file_heading_pattern.match(next_line):
-                        feature_text = next_line[1:].lstrip("-*").strip()
-                        if feature_text:
-                            blocks.append({
-                                "object": "block",
-                                "type": "bulleted_list_item",
-                                "bulleted_list_item": {
-                                    "rich_text": [{
-                                        "type": "text",
-                                        "text": {"content": feature_text}
-                                    }]
-                                }
-                            })
-                        i += 1
-                    else:
-                        break
-                else:
-                    break
+                blocks.append(notion_blocks.heading(2, file_name))
         elif line.startswith("*") or line.startswith("-"):
-            # Standalone bullet (not a file name)
-            if not file_heading_pattern.match(line):
-                feature_text = line[1:].lstrip("-*").strip()
-                if feature_text:
-                    blocks.append({
-                        "object": "block",
-                        "type": "bulleted_list_item",
-                        "bulleted_list_item": {
-                            "rich_text": [{
-                                "type": "text",
-                                "text": {"content": feature_text}
-                            }]
-                        }
-                    })
-            i += 1
+            feature_text = line[1:].lstrip("-*").strip()
+            if feature_text:
+                blocks.append(notion_blocks.bullet(feature_text))
         elif line:
             # Fallback: plain paragraph
-            blocks.append({
-                "object": "block",
-                "type": "paragraph",
-                "paragraph": {
-                    "rich_text": [{
-                        "type": "text",
-                        "text": {"content": line}
-                    }]
-                }
-            })
-            i += 1
-        else:
-            i += 1
+            blocks.append(notion_blocks.paragraph(line))
     return blocks
 
 def update_notion_page(summary, features):
-    """Overwrite the Notion page (except title) with summary and features as formatted blocks."""
-    # 1. Delete all children
-    delete_notion_page_children(NOTION_PAGE_ID)
-    # 2. Add new blocks
+    """Make the Notion page (except title) match the summary and features blocks.
+
+    Notion can only append children at the end, so unchanged leading blocks are kept
+    and everything from the first changed block onwards is deleted and re-appended.
+    """
     blocks = parse_features_to_blocks(summary, features)
-    url = f'https://api.notion.com/v1/blocks/{NOTION_PAGE_ID}/children'
-    headers = {
-        'Authorization': f'Bearer {NOTION_TOKEN}',
-        'Content-Type': 'application/json',
-        'Notion-Version': '2022-06-28'
-    }
-    data = {"children": blocks}
-    response = requests.patch(url, headers=headers, json=data)
-    if response.status_code not in (200, 204):
-        raise Exception(f"Failed to update Notion page: {response.text}")
+    existing = [] if FULL_REWRITE else get_notion_page_blocks(NOTION_PAGE_ID)
+    keep = 0
+    while (keep < len(existing) and keep < len(blocks)
+           and block_signature(existing[keep]) == block_signature(blocks[keep])):
+        keep += 1
+    if FULL_REWRITE:
+        delete_notion_page_children(NOTION_PAGE_ID)
+    else:
+        delete_notion_blocks([block['id'] for block in existing[keep:]])
+    try:
+        notion_blocks.append_blocks(NOTION_TOKEN, NOTION_PAGE_ID, blocks[keep:])
+    except Exception as e:
+        raise Exception(f"Failed to update Notion page: {str(e)}")
 
 def main():
     try:
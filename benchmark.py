@@ -0,0 +1,304 @@
+import argparse
+import builtins
+import contextlib
+import datetime
+import gc
+import io
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import list_manager
+from contact_manager import ContactBook
+
+DEFAULT_SIZES = "1000,100000,1000000"
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+# Text each CLI shows in its first input() prompt.
+STARTUP_PROMPTS = {
+    "contact_manager.py": b"Enter command:",
+    "list_manager.py": b"Choose an option",
+}
+WORDS = ["report", "invoice", "call", "email", "review", "meeting", "plan", "draft",
+         "budget", "deploy", "fix", "update", "write", "read", "book", "order"]
+FIRST_NAMES = ["Ana", "Ben", "Carla", "Dan", "Eva", "Filip", "Greta", "Hugo", "Ines", "Joao"]
+LAST_NAMES = ["Silva", "Smith", "Costa", "Novak", "Berg", "Rossi", "Dubois", "Keller"]
+
+
+def generate_contacts(count, seed=0):
+    """Build a list of synthetic contact dicts."""
+    rng = random.Random(seed)
+    contacts = []
+    for i in range(count):
+        first = rng.choice(FIRST_NAMES)
+        last = rng.choice(LAST_NAMES)
+        contacts.append({
+            "name": f"{first} {last} {i}",
+            "phone": f"+351 9{rng.randint(10000000, 99999999)}",
+            "email": f"{first.lower()}.{last.lower()}{i}@example.com" if rng.random() < 0.8 else None,
+        })
+    return contacts
+
+
+def generate_tasks(count, seed=0):
+    """Build a list of synthetic task dicts."""
+    rng = random.Random(seed)
+    today = datetime.date.today()
+    tasks = []
+    for i in range(count):
+        due = None
+        if rng.random() < 0.7:
+            due = (today + datetime.timedelta(days=rng.randint(-30, 60))).isoformat()
+        tasks.append({
+            "task": f"{' '.join(rng.sample(WORDS, 3))} #{i}",
+            "done": rng.random() < 0.3,
+            "due_date": due,
+            "priority": rng.choice(("High", "Medium", "Low")),
+        })
+    return tasks
+
+
+@contextlib.contextmanager
+def scripted_input(answers):
+    """Feed the given answers to input() and silence stdout."""
+    answers = iter(answers)
+    original = builtins.input
+    builtins.input = lambda prompt="": next(answers)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield
+    finally:
+        builtins.input = original
+
+
+def measure(func, repeat, reset=None):
+    """Return (best wall time in seconds, peak traced memory in bytes).
+
+    reset, if given, runs untimed after every call to restore the starting state.
+    """
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+        if reset:
+            reset()
+    # Memory is measured in a separate run so tracing does not skew timings.
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    if reset:
+        reset()
+    return min(times), peak
+
+
+def contact_benchmarks(size, workdir, add_count):
+    path = os.path.join(workdir, f"contacts_{size}.json")
+    with open(path, "w") as f:
+        json.dump(generate_contacts(size), f, indent=4)
+    book = ContactBook(path)
+
+    def add_loop():
+        with scripted_input([]):
+            for i in range(add_count):
+                book.add_contact(f"Bench {i}", "000", "bench@example.com")
+
+    def reset_adds():
+        # Drop the adds from memory, the snapshot (if compaction ran) and the journal,
+        # so every run starts from the generated book with an empty journal.
+        del book.contacts[-add_count:]
+        book.undo_stack.clear()
+        book.save_contacts()
+        if os.path.exists(book.events.path):
+            os.remove(book.events.path)
+
+    def quiet(func, *args):
+        def run():
+            with scripted_input([]):
+                func(*args)
+        return run
+
+    return {
+        "contacts.load": book.load_contacts,
+        "contacts.save": book.save_contacts,
+        "contacts.find": quiet(book.find_contact, "greta"),
+        "contacts.add_loop": (add_loop, reset_adds),
+        "contacts.list_render": quiet(book.list_contacts),
+    }
+
+
+def task_benchmarks(size, workdir, add_count):
+    list_manager.TODO_FILE = os.path.join(workdir, f"tasks_{size}.json")
+    tasks = generate_tasks(size)
+    list_manager.save_tasks(tasks)
+
+    def add_loop():
+        with scripted_input(["bench task", "", "High"] * add_count):
+            for _ in range(add_count):
+                list_manager.add_task(tasks)
+
+    def reset_adds():
+        # The adds were never saved, so their queued change events are dropped too.
+        del tasks[-add_count:]
+        list_manager.pending_events.clear()
+
+    def search(answers):
+        def run():
+            with scripted_input(answers):
+                list_manager.search_tasks(tasks)
+        return run
+
+    def render():
+        with scripted_input([]):
+            list_manager.view_tasks(tasks)
+
+    return {
+        "tasks.load": list_manager.load_tasks,
+        "tasks.save": lambda: list_manager.save_tasks(tasks),
+        "tasks.search_keyword": search(["1", "review"]),
+        "tasks.search_priority": search(["3", "high"]),
+        "tasks.add_loop": (add_loop, reset_adds),
+        "tasks.list_render": render,
+    }
+
+
+def time_to_first_prompt(script, cwd):
+    """Seconds from spawning a CLI until its first prompt appears on stdout."""
+    marker = STARTUP_PROMPTS[script]
+    start = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, os.path.join(REPO_DIR, script)], cwd=cwd,
+                            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    output = b""
+    try:
+        while marker not in output:
+            chunk = os.read(proc.stdout.fileno(), 65536)
+            if not chunk:
+                raise RuntimeError(f"{script} exited before showing a prompt")
+            output += chunk
+        return time.perf_counter() - start
+    finally:
+        proc.kill()
+        proc.wait()
+        proc.stdin.close()
+        proc.stdout.close()
+
+
+def startup_benchmarks(size, workdir):
+    cwd = os.path.join(workdir, f"startup_{size}")
+    os.makedirs(cwd, exist_ok=True)
+    with open(os.path.join(cwd, "contacts.json"), "w") as f:
+        json.dump(generate_contacts(size), f, indent=4)
+    todo_file = os.path.join(cwd, "todo_list.json")
+    tasks = generate_tasks(size)
+    with open(todo_file, "w") as f:
+        json.dump(tasks, f, indent=2)
+
+    def tasks_startup(warm):
+        # Warm starts read the reminders cache; cold starts have to build it.
+        saved = list_manager.TODO_FILE
+        list_manager.TODO_FILE = todo_file
+        try:
+            if warm:
+                list_manager.save_reminders_cache(tasks)
+            elif os.path.exists(list_manager.reminders_cache_file()):
+                os.remove(list_manager.reminders_cache_file())
+        finally:
+            list_manager.TODO_FILE = saved
+        return time_to_first_prompt("list_manager.py", cwd)
+
+    return {
+        "startup.contacts": lambda: time_to_first_prompt("contact_manager.py", cwd),
+        "startup.tasks": lambda: tasks_startup(warm=True),
+        "startup.tasks_cold": lambda: tasks_startup(warm=False),
+    }
+
+
+def run_benchmarks(sizes, repeat, add_count=20, only=None):
+    """Run all benchmarks for each size and return a results dict."""
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in sizes:
+            benches = {}
+            benches.update(contact_benchmarks(size, workdir, add_count))
+            benches.update(task_benchmarks(size, workdir, add_count))
+            for name, func in benches.items():
+                if only and not any(name.startswith(prefix) for prefix in only):
+                    continue
+                func, reset = func if isinstance(func, tuple) else (func, None)
+                seconds, peak = measure(func, repeat, reset)
+                key = f"{name}@{size}"
+                results[key] = {"seconds": seconds, "peak_bytes": peak}
+                print(f"{key:<36} {seconds * 1000:>10.2f} ms {peak / 1024:>12.1f} KiB")
+            for name, func in startup_benchmarks(size, workdir).items():
+                if only and not any(name.startswith(prefix) for prefix in only):
+                    continue
+                # Time to first prompt runs in a child process; memory is not traced.
+                seconds = min(func() for _ in range(repeat))
+                key = f"{name}@{size}"
+                results[key] = {"seconds": seconds, "peak_bytes": None}
+                print(f"{key:<36} {seconds * 1000:>10.2f} ms")
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Print per-benchmark change against a baseline; return names that regressed."""
+    regressions = []
+    print(f"\nComparison against baseline (threshold {threshold:.0%}):")
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if not previous:
+            print(f"{key:<36} (no baseline)")
+            continue
+        change = (current["seconds"] - previous["seconds"]) / previous["seconds"] if previous["seconds"] else 0.0
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            regressions.append(key)
+        print(f"{key:<36} {change:>+8.1%}{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark contact and task stores at scale.")
+    parser.add_argument('--sizes', type=str, default=DEFAULT_SIZES, help='Comma-separated record counts')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per benchmark (best is kept)')
+    parser.add_argument('--add-count', type=int, default=20, help='Records added per add-in-loop run')
+    parser.add_argument('--only', type=str, default=None, help='Comma-separated benchmark name prefixes')
+    parser.add_argument('--output', type=str, default=None, help='Write JSON results to this file')
+    parser.add_argument('--baseline', type=str, default=None, help='JSON results file to compare against')
+    parser.add_argument('--threshold', type=float, default=0.10, help='Relative slowdown flagged as regression')
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    only = [p.strip() for p in args.only.split(",")] if args.only else None
+    results = run_benchmarks(sizes, args.repeat, args.add_count, only)
+
+    if args.output:
+        payload = {
+            "created": datetime.datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "results": results,
+        }
+        with open(args.output, "w") as f:
+            json.dump(payload, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f).get("results", {})
+        if compare(results, baseline, args.threshold):
+            exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""Append-only change-event log for the contact book and the task list.
+
+Every mutation is written as one JSON line with a sequence number, e.g.
+
+    {"seq": 42, "type": "edited", "store": "contacts", "time": "...", "index": 3,
+     "item": {...}, "changes": {"phone": ["555-0100", "555-0199"]}}
+
+In-process observers are called after each event is written. Other processes tail
+the file with iter_events()/follow() and persist a cursor (last seq plus byte
+offset), so they resume where they stopped instead of re-reading the whole store.
+"""
+import datetime
+import os
+import threading
+import time
+
+from instrumentation import record_io
+
+try:
+    import fcntl
+except ImportError:  # Windows: only writers within one process are serialized
+    fcntl = None
+
+EVENT_TYPES = ("added", "edited", "removed", "done")
+TAIL_BLOCK = 4096
+
+
+def last_seq(path):
+    """Sequence number of the last complete event in path (0 if there is none)."""
+    import json
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return 0
+    with f:
+        end = f.seek(0, os.SEEK_END)
+        block = TAIL_BLOCK
+        while True:
+            start = max(0, end - block)
+            f.seek(start)
+            lines = f.read(end - start).split(b"\n")
+            # lines[0] may be cut off unless we read from the start of the file.
+            for line in reversed(lines if start == 0 else lines[1:]):
+                if line.strip():
+                    try:
+                        return json.loads(line)["seq"]
+                    except (ValueError, KeyError):
+                        continue
+            if start == 0:
+                return 0
+            block *= 2
+
+
+class EventLog:
+    """Writes typed change events to an append-only JSONL file and notifies observers."""
+
+    def __init__(self, path):
+        self.path = path
+        self.observers = []
+        self._lock = threading.Lock()
+        self._seq = None
+        self._size = None
+
+    def subscribe(self, callback):
+        """Call callback(event) after every event; returns a function that unsubscribes."""
+        self.observers.append(callback)
+        return lambda: self.observers.remove(callback)
+
+    def emit(self, event_type, store, **fields):
+        return self.emit_batch(store, [dict(fields, type=event_type)])[0]
+
+    def emit_batch(self, store, changes):
+        """Append one event per change dict (each with a "type") in a single write."""
+        import json
+        if not changes:
+            return []
+        for change in changes:
+            if change.get("type") not in EVENT_TYPES:
+                raise ValueError(f"Unknown event type: {change.get('type')}")
+        now = datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds")
+        with self._lock, open(self.path, "a") as f:
+            # Other processes (another CLI session, a script) append to the same file;
+            # holding an exclusive lock from reading the last seq to the write keeps
+            # sequence numbers unique across them.
+            if fcntl:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            size = os.fstat(f.fileno()).st_size
+            if self._seq is None or size != self._size:
+                self._seq = last_seq(self.path)
+            events = []
+            for change in changes:
+                self._seq += 1
+                event = {"seq": self._seq, "type": change["type"], "store": store, "time": now}
+                event.update((k, v) for k, v in change.items() if k != "type")
+                events.append(event)
+            data = "".join(json.dumps(e) + "\n" for e in events)
+            f.write(data)
+            f.flush()
+            self._size = f.tell()
+        record_io("EventLog.emit", written=len(data))
+        for callback in list(self.observers):
+            for event in events:
+                callback(event)
+        return events
+
+
+def iter_events(path, cursor=None):
+    """Yield (event, cursor) for every complete event after cursor.
+
+    The cursor is {"seq": ..., "offset": ...}; the one yielded with an event points
+    just past it, so saving it after handling the event resumes at the next one.
+    If the file was replaced or truncated the offset is discarded and the file is
+    re-read from the start, skipping events up to the cursor's seq.
+    """
+    import json
+    seq = cursor["seq"] if cursor else 0
+    offset = cursor["offset"] if cursor else 0
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return
+    with f:
+        if offset:
+            f.seek(offset - 1)
+            if f.read(1) != b"\n":
+                offset = 0
+        f.seek(offset)
+        read = 0
+        for line in f:
+            # A line without its newline is still being written.
+            if not line.endswith(b"\n"):
+                break
+            offset += len(line)
+            read += len(line)
+            try:
+                event = json.loads(line)
+            except ValueError:
+                continue
+            if event.get("seq", 0) <= seq:
+                continue
+            seq = event["seq"]
+            yield event, {"seq": seq, "offset": offset}
+        record_io("iter_events", read=read)
+
+
+def follow(path, cursor=None, poll_interval=0.5):
+    """Like iter_events, but keeps polling for new events until interrupted."""
+    while True:
+        for event, cursor in iter_events(path, cursor):
+            yield event, cursor
+        time.sleep(poll_interval)
+
+
+def load_cursor(path):
+    import json
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def save_cursor(path, cursor):
+    import json
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(cursor, f)
+    os.replace(tmp_path, path)
+
+
+def main():
+    import argparse
+    import json
+    parser = argparse.ArgumentParser(description="Print change events from a contacts or task event file.")
+    parser.add_argument('events', type=str, nargs='?', default="contacts.json.events", help='Event file to read')
+    parser.add_argument('--cursor-file', type=str, default=None,
+                        help='Resume from and update this cursor file')
+    parser.add_argument('--follow', action='store_true', help='Keep waiting for new events')
+    args = parser.parse_args()
+
+    cursor = load_cursor(args.cursor_file) if args.cursor_file else None
+    reader = follow(args.events, cursor) if args.follow else iter_events(args.events, cursor)
+    try:
+        for event, cursor in reader:
+            print(json.dumps(event), flush=True)
+            if args.cursor_file:
+                save_cursor(args.cursor_file, cursor)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,9 @@
-import json
 import os
-import re
-import csv
+import threading
+from collections import deque
+
+from change_events import EventLog
+from instrumentation import timed, record_io
 
 class Contact:
     def __init__(self, name, phone, email=None, favourite=False):
@@ -11,11 +13,11 @@ class Contact:
         self.favourite = favourite
 
     def to_dict(self):
-        return {"name": self.name, "phone": self.phone, "email": self.email}
+        return {"name": self.name, "phone": self.phone, "email": self.email, "favourite": self.favourite}
 
     @staticmethod
     def from_dict(data):
-        return Contact(data["name"], data["phone"], data.get("email"))
+        return Contact(data["name"], data["phone"], data.get("email"), data.get("favourite", False))
 
     def __str__(self):
         contact_str = f"{self.name} - {self.phone}"
@@ -27,29 +29,76 @@ class Contact:
     def validate_email(email):
         if not email:
             return True
+        import re  # deferred: only needed once an email is entered
         pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
         return bool(re.match(pattern, email))
 
+# Undo/redo keeps this many field-level diffs per stack.
+HISTORY_LIMIT = 100
+# Mutations are appended to a journal next to the JSON file; once it holds this
+# many entries the book is re-serialized and the journal truncated.
+JOURNAL_COMPACT_THRESHOLD = 500
+
 class ContactBook:
-    def __init__(self, filename="contacts.json"):
-        self.contacts = []
+    def __init__(self, filename="contacts.json", background=False):
+        self._contacts = []
+        self._loader = None
+        self._load_error = None
         self.filename = filename
-        self.load_contacts()
+        self.journal_file = filename + ".journal"
+        self.journal_entries = 0
+        self.snapshot_sha = None
+        self.undo_stack = deque(maxlen=HISTORY_LIMIT)
+        self.redo_stack = deque(maxlen=HISTORY_LIMIT)
+        # Live changes (not journal replay) are published here for other consumers.
+        self.events = EventLog(filename + ".events")
+        if background:
+            # Load on a thread so the CLI can show its menu straight away; the first
+            # access to `contacts` waits for the load to finish.
+            self._loader = threading.Thread(target=self._load_in_background, daemon=True)
+            self._loader.start()
+        else:
+            self.load_contacts()
+
+    @property
+    def contacts(self):
+        loader = self._loader
+        if loader is not None and loader is not threading.current_thread():
+            loader.join()
+            self._loader = None
+            if self._load_error:
+                error, self._load_error = self._load_error, None
+                raise error
+        return self._contacts
+
+    @contacts.setter
+    def contacts(self, value):
+        self._contacts = value
+
+    def _load_in_background(self):
+        try:
+            self.load_contacts()
+        except Exception as e:
+            self._load_error = e
 
+    @timed()
     def add_contact(self, name, phone, email=None):
         if email and not Contact.validate_email(email):
             print("Invalid email format. Contact not added.")
             return
-        self.contacts.append(Contact(name, phone, email))
+        contact = Contact(name, phone, email)
+        self.contacts.append(contact)
         print(f"Added contact: {name}")
-        self.save_contacts()
+        self._record({"op": "add", "index": len(self.contacts) - 1, "contact": contact.to_dict()})
 
+    @timed()
     def list_contacts(self):
         if not self.contacts:
             print("No contacts found.")
         for idx, contact in enumerate(self.contacts, 1):
             print(f"{idx}. {contact}")
 
+    @timed()
     def find_contact(self, query):
         matches = [c for c in self.contacts if 
                   query.lower() in c.name.lower() or 
@@ -60,17 +109,24 @@ class ContactBook:
         else:
             print("No matching contact found.")
 
+    @timed()
     def remove_contact(self, index):
         try:
+            if index < 1:
+                raise IndexError(index)
             removed = self.contacts.pop(index - 1)
             print(f"Removed: {removed.name}")
-            self.save_contacts()
+            self._record({"op": "remove", "index": index - 1, "contact": removed.to_dict()})
         except IndexError:
             print("Invalid index.")
 
+    @timed()
     def edit_contact(self, index):
         try:
+            if index < 1:
+                raise IndexError(index)
             contact = self.contacts[index - 1]
+            before = contact.to_dict()
             print(f"Editing contact: {contact}")
             new_name = input(f"New name (press Enter to keep '{contact.name}'): ").strip()
             new_phone = input(f"New phone (press Enter to keep '{contact.phone}'): ").strip()
@@ -86,20 +142,138 @@ class ContactBook:
                     print("Invalid email format. Email not updated.")
             elif new_email == '':
                 contact.email = None
-            self.save_contacts()
+            after = contact.to_dict()
+            changes = {k: [before[k], after[k]] for k in before if before[k] != after[k]}
+            if changes:
+                self._record({"op": "edit", "index": index - 1, "changes": changes})
             print("Contact updated.")
         except IndexError:
             print("Invalid index.")
 
+    @timed()
+    def undo(self):
+        if not self.undo_stack:
+            print("Nothing to undo.")
+            return
+        op = self.undo_stack.pop()
+        inverse = self._invert(op)
+        self._apply(inverse)
+        self._append_journal(inverse)
+        self._publish(inverse)
+        self.redo_stack.append(op)
+        print(f"Undid {op['op']}.")
+
+    @timed()
+    def redo(self):
+        if not self.redo_stack:
+            print("Nothing to redo.")
+            return
+        op = self.redo_stack.pop()
+        self._apply(op)
+        self._append_journal(op)
+        self._publish(op)
+        self.undo_stack.append(op)
+        print(f"Redid {op['op']}.")
+
+    def _record(self, op):
+        self.undo_stack.append(op)
+        self.redo_stack.clear()
+        self._append_journal(op)
+        self._publish(op)
+
+    def _apply(self, op):
+        if op["op"] == "add":
+            self.contacts.insert(op["index"], Contact.from_dict(op["contact"]))
+        elif op["op"] == "remove":
+            del self.contacts[op["index"]]
+        elif op["op"] == "edit":
+            contact = self.contacts[op["index"]]
+            for field, (_, new) in op["changes"].items():
+                setattr(contact, field, new)
+
+    @staticmethod
+    def _invert(op):
+        if op["op"] == "add":
+            return {"op": "remove", "index": op["index"], "contact": op["contact"]}
+        if op["op"] == "remove":
+            return {"op": "add", "index": op["index"], "contact": op["contact"]}
+        changes = {field: [new, old] for field, (old, new) in op["changes"].items()}
+        return {"op": "edit", "index": op["index"], "changes": changes}
+
+    def _publish(self, op):
+        if op["op"] == "edit":
+            self.events.emit("edited", "contacts", index=op["index"],
+                             item=self.contacts[op["index"]].to_dict(), changes=op["changes"])
+        else:
+            event_type = "added" if op["op"] == "add" else "removed"
+            self.events.emit(event_type, "contacts", index=op["index"], item=op["contact"])
+
+    def _append_journal(self, op):
+        import json
+        line = json.dumps(op) + "\n"
+        mode = "a"
+        if self.journal_entries == 0:
+            # A new journal starts with a header naming the snapshot it applies to, so
+            # one left behind by a crash after compaction (or next to a restored
+            # backup) is never replayed onto the wrong contacts.json.
+            line = json.dumps({"snapshot": self.snapshot_sha}) + "\n" + line
+            mode = "w"
+        with open(self.journal_file, mode) as f:
+            f.write(line)
+        record_io("ContactBook.journal", written=len(line))
+        self.journal_entries += 1
+        if self.journal_entries >= JOURNAL_COMPACT_THRESHOLD:
+            self.save_contacts()
+
+    @timed()
     def save_contacts(self):
-        with open(self.filename, "w") as f:
-            json.dump([c.to_dict() for c in self.contacts], f, indent=4)
+        import hashlib
+        import json
+        data = json.dumps([c.to_dict() for c in self.contacts], indent=4).encode("utf-8")
+        tmp_file = self.filename + ".tmp"
+        with open(tmp_file, "wb") as f:
+            f.write(data)
+        record_io("ContactBook.save_contacts", written=len(data))
+        os.replace(tmp_file, self.filename)
+        self.snapshot_sha = hashlib.sha1(data).hexdigest()
+        # The snapshot now contains every journaled change.
+        if os.path.exists(self.journal_file):
+            os.remove(self.journal_file)
+        self.journal_entries = 0
 
+    def compact(self):
+        """Fold a non-empty journal into contacts.json so other readers see the current state."""
+        if self.contacts is not None and self.journal_entries:
+            self.save_contacts()
+
+    @timed()
     def load_contacts(self):
+        import hashlib
+        import json
+        self.snapshot_sha = None
         if os.path.exists(self.filename):
-            with open(self.filename, "r") as f:
-                data = json.load(f)
-                self.contacts = [Contact.from_dict(d) for d in data]
+            with open(self.filename, "rb") as f:
+                data = f.read()
+            record_io("ContactBook.load_contacts", read=len(data))
+            self.snapshot_sha = hashlib.sha1(data).hexdigest()
+            self.contacts = [Contact.from_dict(d) for d in json.loads(data)]
+        self.journal_entries = 0
+        if os.path.exists(self.journal_file):
+            with open(self.journal_file, "r") as f:
+                try:
+                    header = json.loads(f.readline() or "{}")
+                except ValueError:
+                    header = {}
+                if "snapshot" not in header or header["snapshot"] != self.snapshot_sha:
+                    # Overwritten by the next change; its entries are already in, or
+                    # do not belong to, the current snapshot.
+                    print(f"Ignoring {self.journal_file}: it does not match {self.filename}.")
+                    return
+                for line in f:
+                    if line.strip():
+                        self._apply(json.loads(line))
+                        self.journal_entries += 1
+                record_io("ContactBook.load_contacts", read=f.tell())
 
     def export_contacts_csv(self, filename="contacts_export.csv"):
         pass
@@ -114,10 +288,17 @@ class ContactBook:
         pass
 
 def main():
-    book = ContactBook()
+    book = None
     while True:
-        print("\nCommands: add, list, find, remove, edit, exit")
-        cmd = input("Enter command: ").strip().lower()
+        print("\nCommands: add, list, find, remove, edit, undo, redo, exit")
+        if book is None:
+            # Show the prompt before loading starts: JSON parsing holds the GIL, so a
+            # loader started earlier could hold the prompt back until it finished.
+            print("Enter command: ", end="", flush=True)
+            book = ContactBook(background=True)
+            cmd = input().strip().lower()
+        else:
+            cmd = input("Enter command: ").strip().lower()
 
         if cmd == "add":
             name = input("Name: ")
@@ -135,7 +316,12 @@ def main():
         elif cmd == "edit":
             index = int(input("Contact number to edit: "))
             book.edit_contact(index)
+        elif cmd == "undo":
+            book.undo()
+        elif cmd == "redo":
+            book.redo()
         elif cmd == "exit":
+            book.compact()
             break
         else:
             print("Unknown command.")
@@ -0,0 +1,144 @@
+import atexit
+import functools
+import os
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+
+# PROFILE_OPS=1 prints a latency/IO summary on exit, PROFILE_OPS=cprofile also
+# writes cProfile stats to PROFILE_OUTPUT. Unset means every hook is a no-op.
+PROFILE_MODE = os.environ.get("PROFILE_OPS", "").strip().lower()
+ENABLED = PROFILE_MODE not in ("", "0", "false", "off")
+PROFILE_OUTPUT = os.environ.get("PROFILE_OUTPUT", "profile.out")
+
+_NULL = nullcontext()
+
+
+class OpStats:
+    """Call count, latency histogram and IO byte counters for one operation."""
+
+    def __init__(self):
+        self.calls = 0
+        self.total = 0.0
+        self.min = None
+        self.max = 0.0
+        self.buckets = {}
+        self.bytes_read = 0
+        self.bytes_written = 0
+
+    def add(self, elapsed):
+        self.calls += 1
+        self.total += elapsed
+        self.min = elapsed if self.min is None else min(self.min, elapsed)
+        self.max = max(self.max, elapsed)
+        # Power-of-two microsecond buckets: 1us, 2us, 4us, ...
+        bucket = 1
+        micros = elapsed * 1_000_000
+        while bucket < micros:
+            bucket *= 2
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+
+    def percentile(self, pct):
+        """Approximate percentile (seconds) from the histogram upper bounds."""
+        if not self.calls:
+            return 0.0
+        target = self.calls * pct / 100
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= target:
+                # A bucket's upper bound can exceed the slowest call it holds.
+                return min(bucket / 1_000_000, self.max)
+        return self.max
+
+
+stats = {}
+
+
+def _stats_for(name):
+    entry = stats.get(name)
+    if entry is None:
+        entry = stats[name] = OpStats()
+    return entry
+
+
+def timed(name=None):
+    """Decorator recording latency of each call. Returns func unchanged when disabled."""
+    def decorator(func):
+        if not ENABLED:
+            return func
+        label = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _stats_for(label).add(time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+def track(name):
+    """Context manager timing the enclosed block under the given name."""
+    if not ENABLED:
+        return _NULL
+    return _track(name)
+
+
+@contextmanager
+def _track(name):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _stats_for(name).add(time.perf_counter() - start)
+
+
+def record_io(name, read=0, written=0):
+    """Add bytes read/written by a load or save operation."""
+    if not ENABLED:
+        return
+    entry = _stats_for(name)
+    entry.bytes_read += read
+    entry.bytes_written += written
+
+
+def reset():
+    """Clear all collected statistics."""
+    stats.clear()
+
+
+def report(out=None):
+    """Write a summary table of all recorded operations."""
+    out = out or sys.stderr
+    if not stats:
+        return
+    out.write("\nOperation profile:\n")
+    out.write(f"{'operation':<36} {'calls':>7} {'total ms':>10} {'mean us':>10} "
+              f"{'p50 us':>9} {'p99 us':>9} {'max us':>9} {'read B':>10} {'written B':>10}\n")
+    for name in sorted(stats, key=lambda n: -stats[n].total):
+        s = stats[name]
+        mean = s.total / s.calls if s.calls else 0.0
+        out.write(f"{name:<36} {s.calls:>7} {s.total * 1000:>10.2f} {mean * 1e6:>10.1f} "
+                  f"{s.percentile(50) * 1e6:>9.0f} {s.percentile(99) * 1e6:>9.0f} "
+                  f"{s.max * 1e6:>9.0f} {s.bytes_read:>10} {s.bytes_written:>10}\n")
+
+
+def _start_cprofile():
+    import cProfile
+    profiler = cProfile.Profile()
+    profiler.enable()
+
+    def dump():
+        profiler.disable()
+        profiler.dump_stats(PROFILE_OUTPUT)
+        sys.stderr.write(f"cProfile stats written to {PROFILE_OUTPUT}\n")
+    atexit.register(dump)
+
+
+if ENABLED:
+    atexit.register(report)
+    if PROFILE_MODE == "cprofile":
+        _start_cprofile()
@@ -1,19 +1,83 @@
 import os
-import json
 import datetime
+import threading
+
+from change_events import EventLog
+from instrumentation import timed, record_io
 
 TODO_FILE = "todo_list.json"
+# The reminders cache holds undone tasks due within this many days of when it was
+# written, so startup can show reminders without loading the whole list.
+REMINDER_HORIZON_DAYS = 7
+
+# Tasks are only written on save, so changes are queued and published to the event
+# log once they are on disk.
+pending_events = []
+_event_logs = {}
+
+def event_log():
+    """EventLog for the current TODO_FILE; subscribe to it to observe task changes."""
+    path = TODO_FILE + ".events"
+    if path not in _event_logs:
+        _event_logs[path] = EventLog(path)
+    return _event_logs[path]
+
+def queue_event(event_type, index, task, changes=None):
+    change = {"type": event_type, "index": index, "item": dict(task)}
+    if changes:
+        change["changes"] = changes
+    pending_events.append(change)
 
+def publish_events():
+    events = event_log().emit_batch("tasks", pending_events)
+    pending_events.clear()
+    return events
+
+@timed()
 def load_tasks():
+    import json
     if os.path.exists(TODO_FILE):
         with open(TODO_FILE, "r") as f:
-            return json.load(f)
+            tasks = json.load(f)
+            record_io("load_tasks", read=f.tell())
+            return tasks
     return []
 
+def load_tasks_in_background(on_load=None):
+    """Start loading tasks on a thread; return a function that waits for the result.
+
+    on_load(tasks), if given, also runs on the thread once the tasks are loaded.
+    """
+    result = {}
+
+    def run():
+        try:
+            result["tasks"] = load_tasks()
+            if on_load:
+                on_load(result["tasks"])
+        except Exception as e:
+            result["error"] = e
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+
+    def wait():
+        thread.join()
+        if "error" in result:
+            raise result["error"]
+        return result["tasks"]
+    return wait
+
+@timed()
 def save_tasks(tasks):
+    import json
     with open(TODO_FILE, "w") as f:
         json.dump(tasks, f, indent=2)
+        record_io("save_tasks", written=f.tell())
+    save_reminders_cache(tasks)
+    publish_events()
 
+@timed()
 def add_task(tasks):
     task = input("Enter the task: ").strip()
     if task:
@@ -30,10 +94,12 @@ def add_task(tasks):
         if priority not in ("High", "Medium", "Low"):
             priority = "Medium"
         tasks.append({"task": task, "done": False, "due_date": due_date, "priority": priority})
+        queue_event("added", len(tasks) - 1, tasks[-1])
         print("Task added.")
     else:
         print("Empty task not added.")
 
+@timed()
 def view_tasks(tasks):
     if not tasks:
         print("No tasks found.")
@@ -55,57 +121,127 @@ def view_tasks(tasks):
         priority = t.get("priority", "Medium")
         print(f"{i+1}. [{status}] {t['task']} [Priority: {priority}]{due_str}")
 
+@timed()
 def mark_task_done(tasks):
     view_tasks(tasks)
     try:
         index = int(input("Enter task number to mark as done: ")) - 1
         if 0 <= index < len(tasks):
-            tasks[index]["done"] = True
+            if not tasks[index]["done"]:
+                tasks[index]["done"] = True
+                queue_event("done", index, tasks[index])
             print("Task marked as done.")
         else:
             print("Invalid task number.")
     except ValueError:
         print("Please enter a valid number.")
 
+@timed()
 def remove_task(tasks):
     view_tasks(tasks)
     try:
         index = int(input("Enter task number to remove: ")) - 1
         if 0 <= index < len(tasks):
             removed = tasks.pop(index)
+            queue_event("removed", index, removed)
             print(f"Removed task: {removed['task']}")
         else:
             print("Invalid task number.")
     except ValueError:
         print("Please enter a valid number.")
 
-def show_reminders(tasks):
-    today = datetime.date.today()
-    reminders = []
+def reminders_cache_file():
+    return TODO_FILE + ".reminders"
+
+def due_iso(due):
+    """Zero-padded YYYY-MM-DD form of a due date, or None if it is not a date."""
+    # Dates entered through the menu are already in this form; only other spellings
+    # accepted by strptime (e.g. 2024-1-5) need parsing.
+    if len(due) == 10 and due[4] == "-" and due[7] == "-":
+        try:
+            # Still checks the date exists (2024-02-30 is rejected) at a fraction of
+            # strptime's cost.
+            return datetime.date.fromisoformat(due).isoformat()
+        except ValueError:
+            return None
+    try:
+        return datetime.datetime.strptime(due, "%Y-%m-%d").date().isoformat()
+    except Exception:
+        return None
+
+def reminder_candidates(tasks, until=None):
+    """Return [iso_date, due_date, task] for undone tasks with a valid due date (up to `until`, an ISO date)."""
+    candidates = []
     for t in tasks:
         if t.get("done"):
             continue
         due = t.get("due_date")
         if due:
-            try:
-                due_date = datetime.datetime.strptime(due, "%Y-%m-%d").date()
-                if due_date < today:
-                    reminders.append(f"OVERDUE: {t['task']} (was due {due})")
-                elif due_date == today:
-                    reminders.append(f"DUE TODAY: {t['task']}")
-            except Exception:
-                continue
+            iso_date = due_iso(due)
+            if iso_date and (until is None or iso_date <= until):
+                candidates.append([iso_date, due, t["task"]])
+    return candidates
+
+def render_reminders(candidates, today):
+    # Normalized ISO dates compare correctly as strings, so no re-parsing is needed.
+    today = today.isoformat()
+    reminders = []
+    for iso_date, due, task in candidates:
+        if iso_date < today:
+            reminders.append(f"OVERDUE: {task} (was due {due})")
+        elif iso_date == today:
+            reminders.append(f"DUE TODAY: {task}")
+    return reminders
+
+def print_reminders(reminders):
     if reminders:
         print("\nReminders:")
-        for r in reminders:
-            print("-", r)
+        # One write instead of a print per line; there can be thousands of overdue tasks.
+        print("\n".join("- " + r for r in reminders))
+
+@timed()
+def show_reminders(tasks):
+    print_reminders(render_reminders(reminder_candidates(tasks), datetime.date.today()))
+
+def save_reminders_cache(tasks):
+    """Precompute upcoming reminders next to the task file; return today's reminders."""
+    import json
+    today = datetime.date.today()
+    valid_until = (today + datetime.timedelta(days=REMINDER_HORIZON_DAYS)).isoformat()
+    stat = os.stat(TODO_FILE)
+    summary = {
+        "valid_until": valid_until,
+        "mtime_ns": stat.st_mtime_ns,
+        "size": stat.st_size,
+        "candidates": reminder_candidates(tasks, valid_until),
+    }
+    with open(reminders_cache_file(), "w") as f:
+        json.dump(summary, f)
+    return render_reminders(summary["candidates"], today)
+
+def load_cached_reminders():
+    """Return today's reminders from the cache, or None if it is missing or stale."""
+    import json
+    try:
+        stat = os.stat(TODO_FILE)
+        with open(reminders_cache_file(), "r") as f:
+            summary = json.load(f)
+    except (OSError, ValueError):
+        return None
+    today = datetime.date.today()
+    if (summary.get("mtime_ns") != stat.st_mtime_ns or summary.get("size") != stat.st_size
+            or today.isoformat() > summary.get("valid_until", "")):
+        return None
+    return render_reminders(summary["candidates"], today)
 
+@timed()
 def edit_task(tasks):
     view_tasks(tasks)
     try:
         index = int(input("Enter task number to edit: ")) - 1
         if 0 <= index < len(tasks):
             task = tasks[index]
+            before = dict(task)
             print(f"Editing task: {task['task']}")
             new_desc = input(f"New description (press Enter to keep '{task['task']}'): ").strip()
             new_due = input(f"New due date (YYYY-MM-DD, press Enter to keep '{task.get('due_date') or 'None'}'): ").strip()
@@ -126,12 +262,16 @@ def edit_task(tasks):
                 pass  # keep existing priority
             else:
                 print("Invalid priority. Priority not updated.")
+            changes = {k: [before.get(k), task.get(k)] for k in task if before.get(k) != task.get(k)}
+            if changes:
+                queue_event("edited", index, task, changes)
             print("Task updated.")
         else:
             print("Invalid task number.")
     except ValueError:
         print("Please enter a valid number.")
 
+@timed()
 def search_tasks(tasks):
     if not tasks:
         print("No tasks to search.")
@@ -165,8 +305,16 @@ def search_tasks(tasks):
         print("No matching tasks found.")
 
 def main():
-    tasks = load_tasks()
-    show_reminders(tasks)
+    wait_for_tasks = None
+    refresh_reminders = None
+    fresh_reminders = []
+    reminders = load_cached_reminders()
+    if reminders is not None:
+        print_reminders(reminders)
+    elif os.path.exists(TODO_FILE):
+        # Cache miss: build reminders (and the cache) on the loader thread instead of
+        # before the menu; they are shown once the first answer has been read.
+        refresh_reminders = lambda tasks: fresh_reminders.extend(save_reminders_cache(tasks))
     while True:
         print("\nTo-Do List Menu")
         print("1. View tasks")
@@ -176,7 +324,17 @@ def main():
         print("5. Edit task")
         print("6. Exit")
         print("7. Search tasks")
-        choice = input("Choose an option (1-7): ").strip()
+        prompt = "Choose an option (1-7): "
+        if wait_for_tasks is None:
+            # Prompt first, then load (see contact_manager.main for why).
+            print(prompt, end="", flush=True)
+            wait_for_tasks = load_tasks_in_background(on_load=refresh_reminders)
+            prompt = ""
+        choice = input(prompt).strip()
+        tasks = wait_for_tasks()
+        if fresh_reminders:
+            print_reminders(fresh_reminders)
+            fresh_reminders.clear()
 
         if choice == "1":
             view_tasks(tasks)
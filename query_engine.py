@@ -0,0 +1,183 @@
+import argparse
+import datetime
+import itertools
+import os
+import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import list_manager
+from contact_manager import ContactBook
+
+CHUNK_SIZE = 10000
+TOKEN_PATTERN = re.compile(r"[\w.+@-]+")
+
+# Set once per worker process by _init_worker so chunks do not re-send the index.
+_worker_state = {}
+
+
+def tokenize(text):
+    return [w.strip(".-").lower() for w in TOKEN_PATTERN.findall(text)]
+
+
+def contact_keys(contact):
+    """Normalized name and email under which a task can mention a contact."""
+    keys = [" ".join(tokenize(contact["name"]))]
+    if contact.get("email"):
+        keys.append(contact["email"].lower())
+    return keys
+
+
+def build_contact_index(contacts, contact_filter=None):
+    """Hash index of key -> contacts, plus the longest key length in words."""
+    index = {}
+    max_words = 1
+    for contact in contacts:
+        if contact_filter and not contact_filter(contact):
+            continue
+        for key in contact_keys(contact):
+            if not key:
+                continue
+            index.setdefault(key, []).append(contact)
+            max_words = max(max_words, len(key.split()))
+    return index, max_words
+
+
+def probe(text, index, max_words):
+    """Yield (key, contact) once per contact mentioned in text, by name or email."""
+    words = tokenize(text)
+    seen_keys = set()
+    # A task naming a contact by both name and email still joins to it once.
+    seen_contacts = set()
+    for start in range(len(words)):
+        for length in range(1, max_words + 1):
+            if start + length > len(words):
+                break
+            key = " ".join(words[start:start + length])
+            if key in index and key not in seen_keys:
+                seen_keys.add(key)
+                for contact in index[key]:
+                    if id(contact) not in seen_contacts:
+                        seen_contacts.add(id(contact))
+                        yield key, contact
+
+
+def join_chunk(chunk, index, max_words, task_predicate=None):
+    """Join one chunk of (position, task) pairs against the contact index."""
+    rows = []
+    for position, task in chunk:
+        if task_predicate and not task_predicate(task):
+            continue
+        for key, contact in probe(task.get("task", ""), index, max_words):
+            rows.append({"task_index": position, "task": task, "contact": contact, "matched": key})
+    return rows
+
+
+def _init_worker(index, max_words, task_predicate):
+    _worker_state.update(index=index, max_words=max_words, task_predicate=task_predicate)
+
+
+def _join_chunk_in_worker(chunk):
+    return join_chunk(chunk, _worker_state["index"], _worker_state["max_words"], _worker_state["task_predicate"])
+
+
+def _chunks(tasks, chunk_size):
+    chunk = []
+    for position, task in enumerate(tasks, 1):
+        chunk.append((position, task))
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def join_tasks_contacts(tasks, contacts, task_predicate=None, contact_filter=None,
+                        workers=None, chunk_size=CHUNK_SIZE):
+    """Stream rows joining tasks to the contacts their text mentions.
+
+    Contacts are the build side of a hash join (indexed by name and email); tasks are
+    the probe side, split into chunks that run in a process pool with a bounded
+    number in flight, so results stream in task order without holding every chunk's
+    output at once. Predicates must be top-level functions so they can be pickled.
+    With workers=1, or when everything fits in a single chunk, the join runs inline.
+    """
+    index, max_words = build_contact_index(contacts, contact_filter)
+    if not index:
+        return
+    workers = workers or os.cpu_count() or 1
+    chunks = _chunks(tasks, chunk_size)
+    first = next(chunks, None)
+    if first is None:
+        return
+    second = next(chunks, None)
+    if workers == 1 or second is None:
+        for chunk in itertools.chain([first], [second] if second else [], chunks):
+            yield from join_chunk(chunk, index, max_words, task_predicate)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(index, max_words, task_predicate)) as pool:
+        pending = deque(pool.submit(_join_chunk_in_worker, c) for c in (first, second))
+        for chunk in chunks:
+            while len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+            pending.append(pool.submit(_join_chunk_in_worker, chunk))
+        while pending:
+            yield from pending.popleft().result()
+
+
+def is_open(task):
+    return not task.get("done")
+
+
+def is_overdue(task):
+    if task.get("done") or not task.get("due_date"):
+        return False
+    try:
+        due = datetime.datetime.strptime(task["due_date"], "%Y-%m-%d").date()
+    except ValueError:
+        return False
+    return due < datetime.date.today()
+
+
+def is_favourite(contact):
+    return bool(contact.get("favourite"))
+
+
+def load_contacts(filename="contacts.json"):
+    """Load contacts as plain dicts (including the favourite flag) for joining."""
+    book = ContactBook(filename)
+    return [c.to_dict() for c in book.contacts]
+
+
+TASK_FILTERS = {"open": is_open, "overdue": is_overdue}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List tasks that mention contacts by name or email.")
+    parser.add_argument('--contacts', type=str, default="contacts.json", help='Contacts JSON file')
+    parser.add_argument('--tasks', type=str, default=list_manager.TODO_FILE, help='Tasks JSON file')
+    parser.add_argument('--favourites', action='store_true', help='Only join favourite contacts')
+    parser.add_argument('--filter', choices=sorted(TASK_FILTERS), default=None, help='Only consider these tasks')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    args = parser.parse_args()
+
+    list_manager.TODO_FILE = args.tasks
+    rows = join_tasks_contacts(
+        list_manager.load_tasks(),
+        load_contacts(args.contacts),
+        task_predicate=TASK_FILTERS.get(args.filter),
+        contact_filter=is_favourite if args.favourites else None,
+        workers=args.workers,
+    )
+    found = 0
+    for row in rows:
+        found += 1
+        print(f"{row['task_index']}. {row['task']['task']} -> {row['contact']['name']} (matched '{row['matched']}')")
+    if not found:
+        print("No tasks mention a matching contact.")
+
+
+if __name__ == "__main__":
+    main()